@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 
 import os
+import sys
 import time
+import errno
 import json
 import shutil
 import argparse
@@ -9,26 +11,36 @@ import threading
 import subprocess
 import contextlib
 import io
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+import signal
 import platform
 import obsws_python as obs
 import pywinctl
 
+try:  # Optional, faster config (de)serialization
+    import orjson
+except ImportError:
+    orjson = None
+
 # === Example for -T and -S ===
 # -T '{"/mnt/AufnahmeSpeicher": "/home/smb/AufnahmeSpeicher/"}'
 # -S '{"OBS-move-rec-python3-Konsole": "OBSmovRec-Konsole"}'
 # =============================
 
+SYSTEM = platform.system()
+
 
+@lru_cache(maxsize=None)
 def get_config_dir(app_name):
     config_dir = None
 
-    if platform.system() == "Windows":
+    if SYSTEM == "Windows":
         # Windows
         appdata = os.getenv("APPDATA")
         if appdata:
             config_dir = os.path.join(appdata, app_name)
-    elif platform.system() == "Darwin":  # macOS
+    elif SYSTEM == "Darwin":  # macOS
         config_dir = os.path.join(
             os.path.expanduser("~"), "Library", "Application Support", app_name
         )
@@ -45,22 +57,46 @@ CONFIG_DIR = get_config_dir(APP_NAME)
 CONFIG_PATH = os.path.join(CONFIG_DIR, "mover_config.json")
 
 
+# Config file content as last read or written, to skip unchanged saves
+last_saved_config = None
+
+
+def dump_config(config):
+    if orjson:
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2)
+    return json.dumps(config, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def parse_config(data):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
 # Load config if it exists
 def load_config():
+    global last_saved_config
     if os.path.exists(CONFIG_PATH):
         try:
-            with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(CONFIG_PATH, "rb") as f:
+                data = f.read()
+            config = parse_config(data)
+            last_saved_config = data
+            return config
         except Exception:
             pass
     return {}
 
 
-# Save config to disk
+# Save config to disk (only if it changed)
 def save_config(config):
+    global last_saved_config
+    data = dump_config(config)
+    if data == last_saved_config:
+        return
+
     os.makedirs(CONFIG_DIR, exist_ok=True)
-    with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-        json.dump(config, f, indent=4)
+    with open(CONFIG_PATH, "wb") as f:
+        f.write(data)
+    last_saved_config = data
 
 
 # Setup argument parser with config as default
@@ -130,15 +166,46 @@ def setup_arg_parser(config_defaults):
     return args
 
 
+class RecorderState:
+    """Recording state shared by the OBS event handlers and the tracker."""
+
+    __slots__ = (
+        "recording_active",
+        "last_output_active",
+        "latest_output_paths",
+        "latest_output_set",
+        "last_output_paths",
+        "focus_thread",
+        "stop_focus_event",
+    )
+
+    def __init__(self):
+        self.recording_active = False
+        self.last_output_active = None
+        self.latest_output_paths = []
+        self.latest_output_set = set()  # Mirrors latest_output_paths for lookups
+        self.last_output_paths = set()
+        self.focus_thread = None
+        self.stop_focus_event = threading.Event()
+
+
 # Shared state
-recording_active = False
-latest_output_path = None
-window_focus_times = defaultdict(float)
-focus_thread = None
-stop_focus_thread = False
-last_output_active = None
-latest_output_paths = []
-last_output_paths = []
+state = RecorderState()
+window_focus_times = {}
+exit_event = threading.Event()
+track_process = None
+track_fields = None  # NUL separated fields read from track_process
+# Moves run here, so OBS events aren't blocked while a recording is copied
+move_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mover")
+pending_moves = set()
+
+# Runs the track command in a shell loop, each title is followed by its exit code
+# and stderr (all NUL terminated), so a poll only costs a pipe read instead of a
+# new process. stdout goes to the pipe through fd 3, stderr is captured in $err.
+TRACK_LOOP = (
+    "while true; do err=$({{ {command}\n}} 2>&1 >&3); "
+    "printf '\\0%s\\0%s\\0' \"$?\" \"$err\"; sleep {interval}; done 3>&1"
+)
 
 
 def get_focused_window_title():
@@ -146,6 +213,35 @@ def get_focused_window_title():
     return win.title if win else "Desktop"
 
 
+# Title parts to ignore (graphics API suffixes)
+IRRELEVANT_KEYWORDS = (
+    "vulkan",
+    "direct3d",
+    "opengl",
+    "metal",
+    "dx12",
+    "dx11",
+    "dx9",
+)
+
+
+class TitleCharTable(dict):
+    """str.translate table keeping alphanumerics and " _-", filled on first use."""
+
+    def __missing__(self, codepoint):
+        ch = chr(codepoint)
+        keep = codepoint if ch.isalnum() or ch in " _-" else None
+        self[codepoint] = keep
+        return keep
+
+
+TITLE_CHARS = TitleCharTable()
+# ASCII bytes the table drops, for the bytes.translate fast path
+TITLE_DELETE_BYTES = bytes(c for c in range(128) if TITLE_CHARS[c] is None)
+
+
+# Pure function, recurring window titles are served from the cache
+@lru_cache(maxsize=1024)
 def extract_relevant_title(title: str) -> str:
     # Normalize separators
     title = title.replace("—", "-").strip()
@@ -155,20 +251,9 @@ def extract_relevant_title(title: str) -> str:
 
     # If nothing to process, return as-is
     if parts:
-        # Words to ignore
-        irrelevant_keywords = [
-            "vulkan",
-            "direct3d",
-            "opengl",
-            "metal",
-            "dx12",
-            "dx11",
-            "dx9",
-        ]
-
         # Pop last entriey if irrelevant (case-insensitive)
         last = parts[-1].lower().replace(" ", "")
-        for kw in irrelevant_keywords:
+        for kw in IRRELEVANT_KEYWORDS:
             if kw in last and len(last) < len(kw) + 6:
                 parts.pop()
 
@@ -183,12 +268,85 @@ def extract_relevant_title(title: str) -> str:
         chosen = title
 
     # Final cleanup: remove stray punctuation and collapse spaces
-    chosen = "".join(ch for ch in chosen if ch.isalnum() or ch in " _-").strip()
+    if chosen.isascii():
+        chosen = chosen.encode("ascii").translate(None, TITLE_DELETE_BYTES).decode()
+    else:
+        chosen = chosen.translate(TITLE_CHARS)
     chosen = "-".join(chosen.split())
 
     return chosen
 
 
+def start_track_process():
+    global track_process, track_fields
+    if SYSTEM == "Windows":
+        return None  # No sh loop available, run the command every interval instead
+
+    try:
+        track_process = subprocess.Popen(
+            [
+                "sh",
+                "-c",
+                TRACK_LOOP.format(command=TRACK_COMMAND, interval=TRACK_INTERVAL),
+            ],
+            stdout=subprocess.PIPE,
+            start_new_session=True,
+        )
+        track_fields = read_nul_fields(track_process.stdout)
+    except OSError as e:
+        print(f"[WARN] Could not start window title command loop: {e}")
+        track_process = None
+    return track_process
+
+
+def stop_track_process():
+    global track_process, track_fields
+    proc, track_process = track_process, None
+    track_fields = None
+    if proc:
+        try:
+            # Kill the whole loop, so a running sleep doesn't keep the pipe open
+            os.killpg(proc.pid, signal.SIGTERM)
+        except OSError:
+            pass
+        proc.wait()
+
+
+def read_nul_fields(stream):
+    rest = b""
+    while True:
+        chunk = stream.read1(4096)
+        if not chunk:
+            return  # Process ended
+        *fields, rest = (rest + chunk).split(b"\0")
+        for field in fields:
+            yield field.decode("utf-8", "replace")
+
+
+def read_track_process():
+    fields = track_fields
+    if not fields:
+        return None
+
+    # stdout, exit code, stderr
+    output, returncode, stderr = (next(fields, None) for _ in range(3))
+    if stderr is None:
+        return None  # Process ended
+    if not returncode.isdigit():
+        return None  # Output contained a NUL, the fields are out of step
+    return output, int(returncode), stderr
+
+
+def run_track_command():
+    result = subprocess.run(TRACK_COMMAND, shell=True, capture_output=True, text=True)
+    return result.stdout, result.returncode, result.stderr
+
+
+def add_focus_time(title, secs):
+    if title:
+        window_focus_times[title] = window_focus_times.get(title, 0.0) + secs
+
+
 def window_tracker():
     if not CHECK_TRACK:
         print("[INFO] Window tracking started.\n")
@@ -199,59 +357,90 @@ def window_tracker():
         )
 
     last_title = None
+    # Focus time of the current title, only added to window_focus_times on change
+    pending_title = None
+    pending_time = 0.0
     except_msg = None
     last_except = None
     print_cyle = {}
 
+    piped = bool(TRACK_COMMAND and start_track_process())
+
     last_time = time.time()
 
-    while not stop_focus_thread:
-        if TRACK_COMMAND:
-            result = subprocess.run(
-                TRACK_COMMAND, shell=True, capture_output=True, text=True
-            )
-            if result.returncode == 0:
-                current_title = result.stdout or "Desktop"
+    try:
+        while not state.stop_focus_event.is_set():
+            if TRACK_COMMAND:
+                result = read_track_process() if piped else None
+                if result is None:
+                    if state.stop_focus_event.is_set():
+                        break
+                    if piped:
+                        print(
+                            "[WARN] Window title command loop ended or sent unexpected output, running the command every interval instead."
+                        )
+                        piped = False
+                        stop_track_process()
+                    result = run_track_command()
+
+                stdout, returncode, stderr = result
+                if returncode == 0:
+                    current_title = stdout or "Desktop"
+                else:
+                    current_title = "Desktop"
+                    except_msg = f"Window title command, results in errorcode {returncode} with message: {stdout} {stderr}"
+                    if except_msg != last_except:
+                        print(except_msg)
+                    last_except = except_msg
             else:
-                current_title = "Desktop"
-                except_msg = f"Window title command, results in errorcode {result.returncode} with message: {result.stdout} {result.stderr}"
-                if except_msg != last_except:
-                    print(except_msg)
-                last_except = except_msg
-        else:
-            try:
-                current_title = get_focused_window_title()
-            except Exception as e:
-                current_title = "Desktop"
-                except_msg = f"Unable to get window title: {e}"
-                if except_msg != last_except:
-                    print(except_msg)
-                last_except = except_msg
+                try:
+                    current_title = get_focused_window_title()
+                except Exception as e:
+                    current_title = "Desktop"
+                    except_msg = f"Unable to get window title: {e}"
+                    if except_msg != last_except:
+                        print(except_msg)
+                    last_except = except_msg
+
+            now = time.time()
+
+            if last_title:
+                if last_title != pending_title:
+                    add_focus_time(pending_title, pending_time)
+                    pending_title = last_title
+                    pending_time = 0.0
+                pending_time += now - last_time
+
+            last_title = current_title
+            last_time = now
+            # The command loop already sleeps, else wait (returns early on stop)
+            if not piped and state.stop_focus_event.wait(TRACK_INTERVAL):
+                break
 
-        now = time.time()
+            if CHECK_TRACK and last_title.strip():
+                time_last = window_focus_times.get(last_title, 0.0)
+                if last_title == pending_title:
+                    time_last += pending_time
+                if time_last:
+                    next_print = print_cyle.get(last_title, 1)
+                    if next_print < time_last:
+                        print_cyle[last_title] = wait_print_cyle + next_print
+                        print("[INFO] Raw Title: " + last_title.strip())
+                        sanitize(last_title)
+                        print("[INFO] Active for secs: " + str(round(time_last, 2)))
+                        print()
+    finally:
+        # Runs even if the loop fails, so the time tracked so far isn't lost
+        stop_track_process()
 
+        # Final update
         if last_title:
-            window_focus_times[last_title] += now - last_time
-
-        last_title = str(current_title)
-        last_time = float(now)
-        time.sleep(TRACK_INTERVAL)
-
-        if CHECK_TRACK:
-            if last_title.strip() and window_focus_times.get(last_title):
-                time_last = window_focus_times.get(last_title)
-                if print_cyle.get(last_title, 1) < time_last:
-                    print_cyle[last_title] = wait_print_cyle + print_cyle.get(
-                        last_title, 1
-                    )
-                    print("[INFO] Raw Title: " + last_title.strip())
-                    sanitize(last_title)
-                    print("[INFO] Active for secs: " + str(round(time_last, 2)))
-                    print()
-
-    # Final update
-    if last_title:
-        window_focus_times[last_title] += time.time() - last_time
+            if last_title != pending_title:
+                add_focus_time(pending_title, pending_time)
+                pending_title = last_title
+                pending_time = 0.0
+            pending_time += time.time() - last_time
+        add_focus_time(pending_title, pending_time)
 
     print("[INFO] Window tracking stopped.")
 
@@ -269,10 +458,12 @@ def sanitize(title: str) -> str:
 
 def path_translate(path: str) -> str:
     norm_path = os.path.normpath(path)
-    for src_prefix, dst_prefix in PATH_TRANSLATE.items():
-        if norm_path.startswith(src_prefix):
+    for src_prefix, src_dir, dst_prefix in PATH_TRANSLATE_TABLE:
+        # Only match whole path components ("/mnt/a" must not match "/mnt/ab")
+        if norm_path.startswith(src_dir) or norm_path == src_prefix:
+            # Both are normalized, so the rest of the path is just a slice
+            relative_part = norm_path[len(src_prefix) :].lstrip(os.sep)
             # Use os.path.join to ensure correct separator
-            relative_part = os.path.relpath(norm_path, src_prefix)
             p = os.path.join(dst_prefix, relative_part)
             print(f"[INFO] Found Translatiton for: '{path}'")
             print(f"[INFO] Translating to: '{p}'")
@@ -281,6 +472,61 @@ def path_translate(path: str) -> str:
     return path
 
 
+# Chunk size for copy_file_range when moving recordings across filesystems
+COPY_CHUNK = 1 << 28
+
+
+def copy_file_range(src, dst):
+    """Copy with copy_file_range, False if it isn't usable for this file pair."""
+    if not hasattr(os, "copy_file_range"):
+        return False
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        try:
+            while os.copy_file_range(src_fd, dst_fd, COPY_CHUNK):
+                pass
+        except OSError:
+            # Only fall back if nothing was copied yet
+            if os.lseek(dst_fd, 0, os.SEEK_CUR):
+                raise
+            return False
+    return True
+
+
+def copy_file(src, dst):
+    # copy_file_range can reflink or copy server side (btrfs, NFS), else use
+    # shutil's fast copy (sendfile on Linux, fcopyfile on macOS)
+    if not copy_file_range(src, dst):
+        shutil.copyfile(src, dst)
+
+    # The source gets deleted after this, so make sure nothing is missing
+    src_size = os.stat(src).st_size
+    dst_size = os.stat(dst).st_size
+    if dst_size != src_size:
+        raise OSError(
+            f"Incomplete copy of '{src}': {dst_size} of {src_size} bytes written"
+        )
+
+
+def move_file(src, dst):
+    try:
+        os.replace(src, dst)  # Same filesystem, just a rename
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+
+    try:
+        copy_file(src, dst)
+        shutil.copystat(src, dst)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(dst)
+        raise
+    os.remove(src)
+
+
 def move_recording(path, window_title):
     path = path_translate(path)
 
@@ -298,21 +544,30 @@ def move_recording(path, window_title):
     dest_path = os.path.join(target_dir, filename)
 
     try:
-        shutil.move(path, dest_path)
+        move_file(path, dest_path)
         print(f"[INFO] Recording moved to: '{dest_path}'")
     except Exception as e:
         print(f"[ERROR] Failed to move recording: {e}")
 
 
+def report_move(future):
+    pending_moves.discard(future)
+    if future.cancelled():
+        return
+    e = future.exception()
+    if e:
+        print(f"[ERROR] Failed to move recording: {e}")
+
+
 def add_files(path):
-    global latest_output_paths, last_output_paths
     if (
         path
         and isinstance(path, str)
-        and path not in latest_output_paths
-        and path not in last_output_paths
+        and path not in state.latest_output_set
+        and path not in state.last_output_paths
     ):
-        latest_output_paths.append(path)
+        state.latest_output_paths.append(path)
+        state.latest_output_set.add(path)
         print(f"[INFO] OBS Recording file path added: '{path}'")
 
 
@@ -327,49 +582,53 @@ def on_record_file_changed(data):
 
 
 def on_record_state_changed(data):
-    global recording_active, focus_thread, stop_focus_thread
-    global last_output_active, window_focus_times
-    global latest_output_paths, last_output_paths
-
     output_active = data.output_active
     add_files(data.output_path)
 
     p = data.output_state
-    if output_active == last_output_active or p in [
+    if output_active == state.last_output_active or p in [
         "OBS_WEBSOCKET_OUTPUT_RESUMED",
         "OBS_WEBSOCKET_OUTPUT_PAUSED",
     ]:
         return  # Avoid triggering on pause/resume
 
-    last_output_active = output_active
+    state.last_output_active = output_active
 
     if output_active:
         print("[OBS] Recording started.")
-        recording_active = True
+        state.recording_active = True
         window_focus_times.clear()
-        stop_focus_thread = False
-        focus_thread = threading.Thread(target=window_tracker, daemon=True)
-        focus_thread.start()
+        state.stop_focus_event.clear()
+        state.focus_thread = threading.Thread(target=window_tracker, daemon=True)
+        state.focus_thread.start()
     else:
         print("[OBS] Recording stopped.")
-        recording_active = False
-        stop_focus_thread = True
-        if focus_thread:
-            focus_thread.join()
+        state.recording_active = False
+        state.stop_focus_event.set()
+        stop_track_process()
+        if state.focus_thread:
+            state.focus_thread.join()
 
-        if latest_output_paths:
+        if state.latest_output_paths:
             if window_focus_times:
-                dominant_window = max(window_focus_times.items(), key=lambda x: x[1])[0]
+                dominant_window = max(
+                    window_focus_times, key=window_focus_times.__getitem__
+                )
                 print(f"[INFO] Dominant window: {dominant_window}")
             else:
                 dominant_window = "Unknown"
                 print("[WARN] No window activity tracked.")
 
-            for latest_output_path in latest_output_paths:
-                move_recording(latest_output_path, dominant_window)
+            for latest_output_path in state.latest_output_paths:
+                future = move_pool.submit(
+                    move_recording, latest_output_path, dominant_window
+                )
+                pending_moves.add(future)
+                future.add_done_callback(report_move)
 
-            last_output_paths = list(latest_output_paths)
-            latest_output_paths = []
+            state.last_output_paths = set(state.latest_output_paths)
+            state.latest_output_paths.clear()
+            state.latest_output_set.clear()
         else:
             print("[WARN] No output path recorded from OBS.")
 
@@ -380,7 +639,7 @@ def on_record_state_changed(data):
 def main():
     global OBS_HOST, OBS_PORT, OBS_PASSWORD, DESTINATION_BASE
     global TRACK_INTERVAL, TRACK_COMMAND, CHECK_TRACK
-    global PATH_TRANSLATE, SHORT_HANDS
+    global PATH_TRANSLATE, PATH_TRANSLATE_TABLE, SHORT_HANDS
 
     config_defaults = load_config()
     args = setup_arg_parser(config_defaults)
@@ -397,6 +656,12 @@ def main():
         args.translate = {}
 
     PATH_TRANSLATE = args.translate
+    # Normalized once, longest prefix first so nested translations win
+    PATH_TRANSLATE_TABLE = []
+    for src, dst in PATH_TRANSLATE.items():
+        src = os.path.normpath(src)
+        PATH_TRANSLATE_TABLE.append((src, os.path.join(src, ""), dst))
+    PATH_TRANSLATE_TABLE.sort(key=lambda item: len(item[0]), reverse=True)
 
     # Load shorthand map
     if not args.shorthand:
@@ -425,12 +690,13 @@ def main():
     CHECK_TRACK = args.check_track
 
     if CHECK_TRACK:
-        stop_focus_thread = False
+        state.stop_focus_event.clear()
         print("\n[INFO] Running in Tracking Only Mode.")
         print("[INFO] Close with Ctrl+c\n")
         try:
             window_tracker()
         except KeyboardInterrupt:
+            stop_track_process()
             print("\n[Info] Stopping Tracking")
         except Exception as e:
             print(f"\n[Warn] Window Tracking error: {e}")
@@ -459,9 +725,11 @@ def main():
 
             print("[INFO] Connected to OBS.")
 
-            # Save successful connection info
-            config_defaults["successful_sockets"][host_string] = int(time.time())
-            save_config(config_defaults)
+            # Save successful connection info (a minute resolution is enough)
+            now = int(time.time())
+            if now - (last_success or 0) > 60:
+                config_defaults["successful_sockets"][host_string] = now
+                save_config(config_defaults)
             break
 
         except Exception:
@@ -478,22 +746,47 @@ def main():
                 cl_evt = None
                 break
 
-    # Now listen normally
+    # Now listen normally, Ctrl+C just sets exit_event
+    signal.signal(signal.SIGINT, lambda *_: exit_event.set())
+    # Windows can't interrupt a blocking wait for signals, so wake up there
+    wait_timeout = 1 if SYSTEM == "Windows" else None
     try:
         print("[INFO] Listening to events...")
-        while True:
-            time.sleep(1)
-
-    except KeyboardInterrupt:
+        while not exit_event.wait(wait_timeout):
+            pass
         print("\n[INFO] Exiting.")
     finally:
-        stop_focus_thread = True
+        state.stop_focus_event.set()
+        stop_track_process()
         if cl_evt:
             try:
                 cl_evt.disconnect()
             except Exception:
                 pass
 
+        # Let running moves finish, Ctrl+C interrupts again from here on
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        if pending_moves:
+            print(
+                f"[INFO] Waiting for {len(pending_moves)} recording move(s) to finish, press Ctrl+C to skip queued moves."
+            )
+        try:
+            move_pool.shutdown(wait=True)
+        except KeyboardInterrupt:
+            move_pool.shutdown(wait=False, cancel_futures=True)
+            print(
+                "\n[WARN] Skipped queued moves, waiting for running copies to finish. Press Ctrl+C again to quit right away."
+            )
+            try:
+                wait(list(pending_moves))
+            except KeyboardInterrupt:
+                # A source is only deleted after a complete copy, so it is kept
+                print(
+                    "\n[WARN] Quit during a move, the original recording is kept but a partial copy may remain."
+                )
+                sys.stdout.flush()
+                os._exit(130)  # Don't wait for the copy threads at interpreter exit
+
 
 if __name__ == "__main__":
     main()